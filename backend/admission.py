@@ -0,0 +1,77 @@
+"""
+Admission control for OCR-heavy work
+
+OCR runs on its own small thread pool, so it can never take the threads that
+serve lightweight endpoints like login and get_receipts. At most
+OCR_MAX_CONCURRENCY jobs run at once and OCR_MAX_QUEUE more may wait. Anything
+beyond that is rejected immediately with 503 + Retry-After, not left to
+time out. Limits and counters are per worker process.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+# Leave a core free for the lightweight endpoints by default
+OCR_MAX_CONCURRENCY = int(os.getenv("OCR_MAX_CONCURRENCY", str(max(1, (os.cpu_count() or 2) - 1))))
+OCR_MAX_QUEUE = int(os.getenv("OCR_MAX_QUEUE", "20"))
+OCR_RETRY_AFTER_SECONDS = int(os.getenv("OCR_RETRY_AFTER_SECONDS", "10"))
+
+
+class AdmissionController:
+    """Bounded concurrency + bounded wait queue in front of a dedicated executor"""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, retry_after: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=name)
+        self._semaphore = None
+        self.pending = 0  # running + waiting
+        self.running = 0
+        self.admitted_total = 0
+        self.rejected_total = 0
+
+    def check(self):
+        """Raise 503 if a new job would not fit in the queue"""
+        if self.pending >= self.max_concurrency + self.max_queue:
+            self.rejected_total += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy processing receipts, please try again shortly",
+                headers={"Retry-After": str(self.retry_after)}
+            )
+
+    async def run(self, fn, *args):
+        """Run fn(*args) on the executor once a slot is free"""
+        self.check()
+        if self._semaphore is None:
+            # Created lazily so it binds to the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.pending += 1
+        self.admitted_total += 1
+        try:
+            async with self._semaphore:
+                self.running += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(self.executor, fn, *args)
+                finally:
+                    self.running -= 1
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self.pending - self.running,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted_total": self.admitted_total,
+            "rejected_total": self.rejected_total
+        }
+
+
+ocr_admission = AdmissionController("ocr", OCR_MAX_CONCURRENCY, OCR_MAX_QUEUE, OCR_RETRY_AFTER_SECONDS)
@@ -0,0 +1,132 @@
+"""
+Cold-storage recompression of old receipt images.
+
+Originals older than --max-age-days are re-encoded as WebP at a quality that
+stays legible for audits. The new file is written next to the original as
+"<original name>.webp", image_path is switched in a transaction, and only then
+is the original removed. /uploads still serves the old URL for archived files.
+
+Run from the backend directory (safe to schedule from cron):
+    python archive_images.py [--max-age-days 90] [--quality 70] [--dry-run]
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+
+from PIL import Image, ImageOps
+
+from database import SessionLocal, init_db
+from models import Receipt
+from events import publish_event, RECEIPT_UPDATED
+
+ARCHIVE_SUFFIX = ".webp"
+DEFAULT_MAX_AGE_DAYS = int(os.getenv("ARCHIVE_MAX_AGE_DAYS", "90"))
+DEFAULT_QUALITY = int(os.getenv("ARCHIVE_QUALITY", "70"))
+# Longest edge kept after recompression; phone photos are far larger than
+# needed to read a receipt
+DEFAULT_MAX_DIMENSION = int(os.getenv("ARCHIVE_MAX_DIMENSION", "2400"))
+
+
+def recompress(src_path: str, dest_path: str, quality: int, max_dimension: int):
+    """Write a WebP copy of src_path to dest_path via a temp file"""
+    tmp_path = f"{dest_path}.tmp"
+    with Image.open(src_path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.thumbnail((max_dimension, max_dimension))
+        image.save(tmp_path, "WEBP", quality=quality, method=6)
+    os.replace(tmp_path, dest_path)
+
+
+def archive_receipt(db, receipt: Receipt, quality: int, max_dimension: int, dry_run: bool) -> int:
+    """Archive one receipt's image; returns bytes saved (0 if skipped)"""
+    src_path = receipt.image_path
+    if not src_path or src_path.endswith(ARCHIVE_SUFFIX) or not os.path.exists(src_path):
+        return 0
+    
+    dest_path = src_path + ARCHIVE_SUFFIX
+    original_size = os.path.getsize(src_path)
+    recompress(src_path, dest_path, quality, max_dimension)
+    saved = original_size - os.path.getsize(dest_path)
+    
+    if saved <= 0 or dry_run:
+        # Already compact (or just measuring): keep the original
+        os.remove(dest_path)
+        return max(saved, 0)
+    
+    try:
+        if receipt.manual_fields is None:
+            # Record the guess now; this update bumps updated_at and would skew it
+            receipt.manual_fields = ",".join(sorted(receipt.corrected_ocr_fields()))
+        receipt.image_path = dest_path
+        publish_event(db, RECEIPT_UPDATED, receipt.id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        os.remove(dest_path)
+        raise
+    
+    os.remove(src_path)
+    return saved
+
+
+def archive_images(max_age_days: int, quality: int, max_dimension: int, dry_run: bool) -> dict:
+    init_db()
+    cutoff = datetime.utcnow() - timedelta(days=max_age_days)
+    stats = {"archived": 0, "skipped": 0, "failed": 0, "bytes_saved": 0}
+    
+    db = SessionLocal()
+    try:
+        receipt_ids = [
+            r.id for r in db.query(Receipt.id)
+            .filter(Receipt.created_at < cutoff)
+            .filter(~Receipt.image_path.endswith(ARCHIVE_SUFFIX))
+            .order_by(Receipt.id.asc())
+        ]
+        print(f"📦 {len(receipt_ids)} receipt images older than {max_age_days} days")
+        
+        for receipt_id in receipt_ids:
+            receipt = db.query(Receipt).filter(Receipt.id == receipt_id).first()
+            if not receipt:
+                continue
+            try:
+                saved = archive_receipt(db, receipt, quality, max_dimension, dry_run)
+            except Exception as e:
+                print(f"❌ Receipt {receipt_id}: {e}")
+                stats["failed"] += 1
+                continue
+            if saved:
+                stats["archived"] += 1
+                stats["bytes_saved"] += saved
+            else:
+                stats["skipped"] += 1
+    finally:
+        db.close()
+    
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompress old receipt images to WebP")
+    parser.add_argument("--max-age-days", type=int, default=DEFAULT_MAX_AGE_DAYS,
+                        help=f"archive images older than this (default: {DEFAULT_MAX_AGE_DAYS})")
+    parser.add_argument("--quality", type=int, default=DEFAULT_QUALITY,
+                        help=f"WebP quality 1-100 (default: {DEFAULT_QUALITY})")
+    parser.add_argument("--max-dimension", type=int, default=DEFAULT_MAX_DIMENSION,
+                        help=f"longest edge in pixels (default: {DEFAULT_MAX_DIMENSION})")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report the space that would be saved without changing anything")
+    args = parser.parse_args()
+    
+    print("🔄 Starting image archival...")
+    print("=" * 50)
+    stats = archive_images(args.max_age_days, args.quality, args.max_dimension, args.dry_run)
+    print("=" * 50)
+    verb = "Would save" if args.dry_run else "Saved"
+    print(f"✅ {stats['archived']} archived, {stats['skipped']} skipped, {stats['failed']} failed")
+    print(f"💾 {verb} {stats['bytes_saved'] / (1024 * 1024):.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@
 Database configuration and session management
 """
 import os
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, text, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -13,10 +14,23 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./treasury.db")
 if SQLALCHEMY_DATABASE_URL.startswith("postgres://"):
     SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+
+# Seconds a SQLite writer waits for another process's write lock before failing
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "30"))
+
 # Create engine with SQLite-specific args only when needed
-connect_args = {"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
+connect_args = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT} if IS_SQLITE else {}
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args)
 
+if IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers in other workers proceed while one worker writes
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -36,3 +50,65 @@ def get_db():
 def init_db():
     """Initialize database and create tables"""
     Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+
+
+def upgrade_schema():
+    """
+    Add nullable columns and indexes that were introduced after a table was
+    first created (create_all only creates missing tables)
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                print(f"✅ Added column {table.name}.{column.name}")
+            existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(bind=conn)
+                    print(f"✅ Added index {index.name}")
+
+
+# Arbitrary key for the PostgreSQL advisory lock guarding one-time startup work
+INIT_LOCK_KEY = 727001
+
+
+@contextmanager
+def init_lock():
+    """
+    Serialize one-time startup work (table creation, default admin) across
+    worker processes. Uses a PostgreSQL advisory lock, or a lock file next to
+    the SQLite database.
+    """
+    if not IS_SQLITE:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": INIT_LOCK_KEY})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": INIT_LOCK_KEY})
+        return
+
+    try:
+        import fcntl
+    except ImportError:
+        # Windows: multi-worker mode is not supported there, run unguarded
+        yield
+        return
+
+    db_file = engine.url.database or "treasury.db"
+    with open(f"{db_file}.init.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
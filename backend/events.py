@@ -0,0 +1,145 @@
+"""
+Receipt event broker for server-sent events (SSE)
+
+Events are written to the receipt_events table in the same transaction as the
+change that caused them. Each worker process runs one polling loop that reads
+new rows and fans them out to its own connected clients, so events reach every
+client no matter which uvicorn worker handled the change.
+"""
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import ReceiptEvent
+
+RECEIPT_CREATED = "receipt.created"
+RECEIPT_UPDATED = "receipt.updated"
+RECEIPT_DELETED = "receipt.deleted"
+OCR_FINISHED = "ocr.finished"
+
+POLL_INTERVAL = float(os.getenv("EVENTS_POLL_INTERVAL_SECONDS", "1"))
+KEEPALIVE_INTERVAL = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+RETENTION = timedelta(minutes=int(os.getenv("EVENTS_RETENTION_MINUTES", "60")))
+SUBSCRIBER_QUEUE_SIZE = 100
+# PostgreSQL can commit a lower id after a higher one; ids this far behind the
+# cursor are re-read each poll so late commits are still delivered
+REORDER_WINDOW = int(os.getenv("EVENTS_REORDER_WINDOW", "100"))
+
+
+def publish_event(db: Session, event_type: str, receipt_id: Optional[int] = None):
+    """Record an event; it is delivered once the caller commits"""
+    db.add(ReceiptEvent(event_type=event_type, receipt_id=receipt_id))
+
+
+def format_sse(event: dict) -> str:
+    """Encode an event dict as an SSE message"""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+def _event_to_dict(e: ReceiptEvent) -> dict:
+    return {
+        "id": e.id,
+        "type": e.event_type,
+        "receipt_id": e.receipt_id,
+        "created_at": e.created_at.isoformat() if e.created_at else None
+    }
+
+
+class EventBroker:
+    """Per-worker fan-out of database events to SSE subscribers"""
+
+    def __init__(self):
+        self.subscribers: set[asyncio.Queue] = set()
+        self.last_id: Optional[int] = None
+        self.floor = 0
+        self.delivered: set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._last_prune = datetime.min
+
+    def _fetch(self, after_id: Optional[int]) -> list[dict]:
+        db = SessionLocal()
+        try:
+            if after_id is None:
+                latest = db.query(ReceiptEvent.id).order_by(ReceiptEvent.id.desc()).first()
+                self.last_id = self.floor = latest[0] if latest else 0
+                return []
+            rows = (
+                db.query(ReceiptEvent)
+                .filter(ReceiptEvent.id > max(self.floor, after_id - REORDER_WINDOW))
+                .order_by(ReceiptEvent.id.asc())
+                .limit(500)
+                .all()
+            )
+            now = datetime.utcnow()
+            if now - self._last_prune > timedelta(minutes=1):
+                # Always keep the newest row: SQLite restarts ids at 1 once the
+                # table is empty, which would stall pollers and Last-Event-ID
+                newest = db.query(func.max(ReceiptEvent.id)).scalar() or 0
+                db.query(ReceiptEvent).filter(
+                    ReceiptEvent.created_at < now - RETENTION,
+                    ReceiptEvent.id < newest
+                ).delete()
+                db.commit()
+                self._last_prune = now
+            return [_event_to_dict(e) for e in rows if e.id not in self.delivered]
+        finally:
+            db.close()
+
+    def replay(self, after_id: int) -> list[dict]:
+        """Events after `after_id` still within retention (for Last-Event-ID)"""
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(ReceiptEvent)
+                .filter(ReceiptEvent.id > after_id)
+                .order_by(ReceiptEvent.id.asc())
+                .limit(500)
+                .all()
+            )
+            return [_event_to_dict(e) for e in rows]
+        finally:
+            db.close()
+
+    async def _poll(self):
+        while self.subscribers:
+            try:
+                events = await asyncio.to_thread(self._fetch, self.last_id)
+            except Exception as e:
+                print(f"⚠️  Event poll failed: {e}")
+                events = []
+            for event in events:
+                self.delivered.add(event["id"])
+                self.last_id = max(self.last_id, event["id"])
+                for queue in list(self.subscribers):
+                    if queue.full():
+                        # Slow client: drop the oldest event rather than block others
+                        queue.get_nowait()
+                    queue.put_nowait(event)
+            if self.last_id is not None:
+                horizon = self.last_id - REORDER_WINDOW
+                self.delivered = {i for i in self.delivered if i > horizon}
+            await asyncio.sleep(POLL_INTERVAL)
+        self._task = None
+
+    def subscribe(self, after_id: Optional[int] = None) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self._task is None:
+            # Start from the client's last seen event, or the current end of the log
+            self.last_id = after_id
+            self.floor = after_id or 0
+            self.delivered = set()
+            self._task = asyncio.create_task(self._poll())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+
+
+broker = EventBroker()
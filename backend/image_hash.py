@@ -0,0 +1,191 @@
+"""
+Perceptual image hashing and near-duplicate lookup for receipt photos.
+
+Uses a 64-bit difference hash (dHash), so the same receipt photographed twice
+gives hashes a few bits apart, while exact byte hashing would miss it. Hashes
+are kept in a multi-index hash table, so a lookup only compares against the
+few hashes that share an exact chunk with it.
+
+Run directly to compute hashes for receipts uploaded before hashing existed:
+    python image_hash.py
+"""
+import os
+import threading
+from datetime import timedelta
+from typing import Optional
+
+from PIL import Image, ImageOps
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from models import Receipt
+
+HASH_SIZE = 8
+
+# Hashes at most this many bits apart are flagged as possible duplicates
+DUPLICATE_MAX_DISTANCE = int(os.getenv("DUPLICATE_MAX_DISTANCE", "6"))
+
+
+def compute_phash(image_path: str) -> str:
+    """64-bit difference hash of an image, as 16 hex characters"""
+    with Image.open(image_path) as image:
+        # Let JPEG decode at reduced size; the hash only needs a thumbnail
+        image.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))
+        image = ImageOps.exif_transpose(image)
+        small = ImageOps.grayscale(image).resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + col]
+            right = pixels[row * (HASH_SIZE + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:016x}"
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class MultiIndexHashTable:
+    """
+    Hamming-distance index over 64-bit hashes (multi-index hashing).
+    Hashes are split into max_distance + 1 chunks; two hashes within
+    max_distance bits must agree exactly on at least one chunk, so a lookup
+    is one dict probe per chunk plus a distance check on those candidates.
+    """
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        num_chunks = max_distance + 1
+        bounds = [round(i * 64 / num_chunks) for i in range(num_chunks + 1)]
+        # (shift, mask) for each chunk
+        self.chunks = [
+            (bounds[i], (1 << (bounds[i + 1] - bounds[i])) - 1) for i in range(num_chunks)
+        ]
+        self.tables = [{} for _ in self.chunks]
+        self.ids_by_hash = {}
+        self.size = 0
+
+    def add(self, value: int, receipt_id: int):
+        self.size += 1
+        ids = self.ids_by_hash.get(value)
+        if ids is not None:
+            ids.append(receipt_id)
+            return
+        self.ids_by_hash[value] = [receipt_id]
+        for table, (shift, mask) in zip(self.tables, self.chunks):
+            table.setdefault((value >> shift) & mask, []).append(value)
+
+    def search(self, value: int) -> list:
+        """(distance, receipt_id) pairs within max_distance, closest first"""
+        seen = set()
+        matches = []
+        for table, (shift, mask) in zip(self.tables, self.chunks):
+            for candidate in table.get((value >> shift) & mask, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = hamming_distance(value, candidate)
+                if distance <= self.max_distance:
+                    matches.extend((distance, receipt_id) for receipt_id in self.ids_by_hash[candidate])
+        return sorted(matches)
+
+
+class DuplicateIndex:
+    """
+    In-memory similarity index of receipt image hashes.
+    Each worker process keeps its own copy and catches up before every lookup
+    on receipts added by other workers (by id) and on hashes filled in later by
+    `python image_hash.py` (by updated_at). Entries are never removed: results
+    are checked against each candidate's current hash in the database, which
+    drops deleted receipts and ids SQLite has reused for a different image.
+    """
+
+    # Rows touched this long before the newest seen updated_at are re-read, to
+    # cover second-resolution timestamps and transactions that commit late
+    UPDATED_OVERLAP = timedelta(seconds=5)
+
+    def __init__(self):
+        self.table = MultiIndexHashTable(DUPLICATE_MAX_DISTANCE)
+        self.last_id = 0
+        self.updated_watermark = None
+        # receipt id -> hash it was last indexed with
+        self.indexed: dict[int, str] = {}
+        self.lock = threading.Lock()
+
+    def sync(self, db: Session):
+        """Load hashes of receipts not yet in the index"""
+        query = db.query(Receipt.id, Receipt.image_phash, Receipt.updated_at)
+        if self.updated_watermark is None:
+            query = query.filter(Receipt.id > self.last_id)
+        else:
+            query = query.filter(or_(
+                Receipt.id > self.last_id,
+                Receipt.updated_at >= self.updated_watermark - self.UPDATED_OVERLAP
+            ))
+        rows = query.filter(Receipt.image_phash.isnot(None)).order_by(Receipt.id.asc()).all()
+        with self.lock:
+            for receipt_id, phash, updated_at in rows:
+                if self.indexed.get(receipt_id) != phash:
+                    self.table.add(int(phash, 16), receipt_id)
+                    self.indexed[receipt_id] = phash
+                self.last_id = max(self.last_id, receipt_id)
+                if updated_at and (self.updated_watermark is None or updated_at > self.updated_watermark):
+                    self.updated_watermark = updated_at
+
+    def find_duplicate(self, db: Session, phash: str) -> Optional[int]:
+        """Id of the closest existing receipt with a similar image, if any"""
+        self.sync(db)
+        value = int(phash, 16)
+        with self.lock:
+            matches = self.table.search(value)
+        if not matches:
+            return None
+        candidate_ids = {receipt_id for _, receipt_id in matches}
+        current = {
+            r.id: r.image_phash
+            for r in db.query(Receipt.id, Receipt.image_phash).filter(Receipt.id.in_(candidate_ids))
+        }
+        for _, receipt_id in matches:
+            stored = current.get(receipt_id)
+            if stored and hamming_distance(value, int(stored, 16)) <= DUPLICATE_MAX_DISTANCE:
+                return receipt_id
+        return None
+
+
+duplicate_index = DuplicateIndex()
+
+
+def backfill_hashes():
+    """Compute image_phash for receipts that don't have one"""
+    from database import SessionLocal, init_db
+    init_db()
+    db = SessionLocal()
+    try:
+        receipts = db.query(Receipt).filter(Receipt.image_phash.is_(None)).all()
+        print(f"🔍 {len(receipts)} receipts without an image hash")
+        for i, receipt in enumerate(receipts, 1):
+            if not os.path.exists(receipt.image_path):
+                continue
+            try:
+                phash = compute_phash(receipt.image_path)
+                if receipt.manual_fields is None:
+                    # Record the guess now; this update bumps updated_at and would skew it
+                    receipt.manual_fields = ",".join(sorted(receipt.corrected_ocr_fields()))
+                receipt.image_phash = phash
+            except Exception as e:
+                print(f"❌ Receipt {receipt.id}: {e}")
+            if i % 100 == 0:
+                db.commit()
+        db.commit()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("🔄 Computing image hashes...")
+    print("=" * 50)
+    backfill_hashes()
+    print("=" * 50)
+    print("✅ Backfill complete!")
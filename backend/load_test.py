@@ -0,0 +1,319 @@
+"""
+Local load test for the Church Treasury API.
+
+Starts the app in a subprocess against a throwaway SQLite database (or any
+local DATABASE_URL you pass), with Tesseract replaced by a stub that sleeps
+for a configurable time. It then sends a mix of login, upload, list, update
+and bulk delete requests at a target rate and reports latency percentiles,
+throughput and error rate per endpoint.
+
+Run from the backend directory:
+    python load_test.py --rate 20 --duration 30 --ocr-latency-ms 800
+    python load_test.py --workers 4 --mix upload=50,list=40,update=10
+"""
+import argparse
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_MIX = "login=5,upload=25,list=35,update=25,bulk_delete=10"
+
+
+# ============ SERVER SIDE ============
+
+def create_stub_app():
+    """uvicorn factory: the real app with OCR replaced by a fixed-latency stub"""
+    import main
+
+    latency = float(os.getenv("LOAD_TEST_OCR_LATENCY_MS", "500")) / 1000
+
+    def stub_extract_receipt_data(image_path: str) -> dict:
+        time.sleep(latency)
+        return {
+            "ocr_price": round(random.uniform(1, 500), 2),
+            "ocr_date": "2025-11-09",
+            "ocr_time": "14:30",
+            "ocr_raw_text": "LOAD TEST\nTOTAL 12.50"
+        }
+
+    main.extract_receipt_data = stub_extract_receipt_data
+    return main.app
+
+
+def start_server(args, workdir: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(workdir, 'load_test.db')}"
+    env["LOAD_TEST_OCR_LATENCY_MS"] = str(args.ocr_latency_ms)
+    env["PYTHONPATH"] = BACKEND_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "load_test:create_stub_app", "--factory",
+            "--host", "127.0.0.1", "--port", str(args.port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL if not args.verbose else None,
+    )
+
+
+def wait_for_server(base_url: str, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + "/", timeout=2):
+                return
+        except Exception:
+            time.sleep(0.3)
+    raise RuntimeError("Server did not start in time")
+
+
+# ============ CLIENT SIDE ============
+
+class Stats:
+    """Thread-safe latency and error collection per endpoint"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.lags = []
+
+    def record_lag(self, seconds: float):
+        with self.lock:
+            self.lags.append(seconds)
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        with self.lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def make_image_bytes() -> bytes:
+    image = Image.new("RGB", (600, 1000), "white")
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=80)
+    return buffer.getvalue()
+
+
+def encode_multipart(fields: dict, files: dict) -> tuple:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for name, (filename, data, content_type) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode() + data + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class LoadClient:
+    """Issues one request per call to run(); keeps receipt ids for updates/deletes"""
+
+    def __init__(self, base_url: str, stats: Stats):
+        self.base_url = base_url
+        self.stats = stats
+        self.token = None
+        self.receipt_ids = []
+        self.ids_lock = threading.Lock()
+        self.image = make_image_bytes()
+
+    def request(self, method: str, path: str, body: bytes = None,
+                content_type: str = None, auth: bool = True):
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        if content_type:
+            req.add_header("Content-Type", content_type)
+        if auth and self.token:
+            req.add_header("Authorization", f"Bearer {self.token}")
+        with urllib.request.urlopen(req, timeout=60) as response:
+            return response.status, response.read()
+
+    def login(self):
+        body = urllib.parse.urlencode({"username": "admin", "password": "admin123"}).encode()
+        status, data = self.request("POST", "/api/login", body,
+                                    "application/x-www-form-urlencoded", auth=False)
+        self.token = json.loads(data)["access_token"]
+
+    def upload(self):
+        body, content_type = encode_multipart(
+            {"user_name": "Load Test", "user_phone": "+10000000000",
+             "item_bought": "Supplies", "approved_by": "Treasurer"},
+            {"image": ("receipt.jpg", self.image, "image/jpeg")},
+        )
+        status, data = self.request("POST", "/api/receipts/upload", body, content_type, auth=False)
+        with self.ids_lock:
+            self.receipt_ids.append(json.loads(data)["receipt_id"])
+
+    def list(self):
+        self.request("GET", "/api/receipts")
+
+    def pick_ids(self, endpoint: str) -> tuple:
+        """Receipt ids for an update/bulk_delete, or () if there aren't enough yet"""
+        with self.ids_lock:
+            if endpoint == "update" and self.receipt_ids:
+                return (random.choice(self.receipt_ids),)
+            if endpoint == "bulk_delete" and len(self.receipt_ids) >= 2:
+                return tuple(self.receipt_ids.pop(random.randrange(len(self.receipt_ids))) for _ in range(2))
+        return ()
+
+    def update(self, receipt_id: int):
+        body = json.dumps({"ocr_price": round(random.uniform(1, 500), 2)}).encode()
+        self.request("PUT", f"/api/receipts/{receipt_id}", body, "application/json")
+
+    def bulk_delete(self, *ids: int):
+        self.request("POST", "/api/receipts/bulk-delete", json.dumps(list(ids)).encode(), "application/json")
+
+    def run(self, endpoint: str, scheduled_at: float):
+        """One request; latency counts from its scheduled time, including any wait for a thread"""
+        self.stats.record_lag(time.perf_counter() - scheduled_at)
+        args = ()
+        if endpoint in ("update", "bulk_delete"):
+            args = self.pick_ids(endpoint)
+            if not args:
+                # Nothing to update/delete yet: upload instead, and report it as one
+                endpoint = "upload"
+        ok = True
+        try:
+            getattr(self, endpoint)(*args)
+        except urllib.error.HTTPError as e:
+            ok = False
+            if e.code == 401:
+                # Token expired or rejected: fetch a new one for later requests
+                try:
+                    self.login()
+                except Exception:
+                    pass
+        except Exception:
+            ok = False
+        self.stats.record(endpoint, time.perf_counter() - scheduled_at, ok)
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ("login", "upload", "list", "update", "bulk_delete"):
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+        weights[name] = float(weight)
+    return weights
+
+
+def drive_traffic(client: LoadClient, weights: dict, rate: float, duration: float, concurrency: int):
+    """
+    Fixed-rate load. Requests are queued on schedule whether or not earlier
+    ones finished, but at most `concurrency` are in flight. A backlog shows up
+    as scheduling lag and in the latencies, which are measured from the
+    scheduled time.
+    """
+    endpoints = list(weights)
+    endpoint_weights = [weights[e] for e in endpoints]
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    sent = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while True:
+            next_at = start + sent * interval
+            if next_at - start >= duration:
+                break
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            endpoint = random.choices(endpoints, weights=endpoint_weights)[0]
+            pool.submit(client.run, endpoint, next_at)
+            sent += 1
+    return time.perf_counter() - start
+
+
+def print_report(stats: Stats, elapsed: float):
+    print(f"\n{'endpoint':<12} {'count':>7} {'rps':>7} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'errors':>7} {'err %':>6}")
+    print("-" * 72)
+    total = 0
+    total_errors = 0
+    for endpoint in sorted(stats.latencies):
+        values = sorted(stats.latencies[endpoint])
+        errors = stats.errors.get(endpoint, 0)
+        total += len(values)
+        total_errors += errors
+        print(f"{endpoint:<12} {len(values):>7} {len(values) / elapsed:>7.1f} "
+              f"{percentile(values, 50) * 1000:>8.1f} {percentile(values, 95) * 1000:>8.1f} "
+              f"{percentile(values, 99) * 1000:>8.1f} {errors:>7} {errors / len(values) * 100:>6.1f}")
+    print("-" * 72)
+    if total:
+        print(f"{'total':<12} {total:>7} {total / elapsed:>7.1f} {'':>26} {total_errors:>7} "
+              f"{total_errors / total * 100:>6.1f}")
+    lags = sorted(stats.lags)
+    if lags:
+        print(f"\nScheduling lag (scheduled -> started): p50 {percentile(lags, 50) * 1000:.1f} ms, "
+              f"p99 {percentile(lags, 99) * 1000:.1f} ms, max {lags[-1] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API with stubbed OCR")
+    parser.add_argument("--rate", type=float, default=10, help="requests per second (default: 10)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of traffic (default: 30)")
+    parser.add_argument("--concurrency", type=int, default=64,
+                        help="max requests in flight (default: 64)")
+    parser.add_argument("--ocr-latency-ms", type=float, default=500,
+                        help="simulated OCR time per upload (default: 500)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (default: 1)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"endpoint weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--port", type=int, default=8765, help="port for the test server (default: 8765)")
+    parser.add_argument("--database-url", default=None,
+                        help="use this database instead of a throwaway SQLite file (it gets written to!)")
+    parser.add_argument("--verbose", action="store_true", help="show server output")
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    workdir = tempfile.mkdtemp(prefix="treasury_load_")
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    print("🔄 Starting load test server...")
+    server = start_server(args, workdir)
+    try:
+        wait_for_server(base_url)
+        stats = Stats()
+        client = LoadClient(base_url, stats)
+        client.login()
+        print(f"🚀 {args.rate} req/s for {args.duration}s, OCR stub {args.ocr_latency_ms} ms, "
+              f"{args.workers} worker(s)")
+        elapsed = drive_traffic(client, weights, args.rate, args.duration, args.concurrency)
+        print_report(stats, elapsed)
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,19 +4,32 @@ FastAPI backend for Church Treasury System
 from fastapi import FastAPI, File, UploadFile, Depends, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from sqlalchemy.sql import func
+from datetime import datetime, timedelta, timezone
 import bcrypt
 from fastapi_jwt_auth import AuthJWT
 from pydantic import BaseModel
 import shutil
 import os
+import asyncio
+import mimetypes
+import orjson
 import re
+import uuid
 from typing import Optional
 
-from database import get_db, init_db
-from models import Receipt, Admin
+from database import get_db, init_db, init_lock, SessionLocal
+from models import Receipt, Admin, ReceiptDeletion
 from ocr_utils import extract_receipt_data
+from image_hash import compute_phash, duplicate_index
+from admission import ocr_admission
+from events import (
+    broker, publish_event, format_sse, KEEPALIVE_INTERVAL,
+    RECEIPT_CREATED, RECEIPT_UPDATED, RECEIPT_DELETED, OCR_FINISHED,
+)
 
 # JWT Configuration
 class Settings(BaseModel):
@@ -65,6 +78,10 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     except ValueError:
         return False
 
+# Number of uvicorn worker processes. Each worker keeps its own SSE
+# subscribers and DB connection pool; shared state lives in the database.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
 # Initialize FastAPI app
 app = FastAPI(title="Church Treasury System")
 
@@ -98,30 +115,62 @@ app.add_middleware(
 # Create uploads folder if not exists (MUST be before mount)
 os.makedirs("uploads", exist_ok=True)
 
+class UploadsStaticFiles(StaticFiles):
+    """
+    Serves /uploads, falling back to the WebP copy made by archive_images.py
+    when an original has been archived, so old image URLs keep working
+    """
+
+    async def get_response(self, path: str, scope):
+        try:
+            return await super().get_response(path, scope)
+        except StarletteHTTPException as exc:
+            if exc.status_code != 404 or path.endswith(".webp"):
+                raise
+            return await super().get_response(path + ".webp", scope)
+
+
+# Older Pythons don't know the archived image type
+mimetypes.add_type("image/webp", ".webp")
+
 # Serve uploaded images
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", UploadsStaticFiles(directory="uploads"), name="uploads")
 
 # Initialize database on startup
 @app.on_event("startup")
 def startup_event():
-    init_db()
-    # Create default superuser admin (username: admin, password: admin123)
-    db = next(get_db())
-    existing_admin = db.query(Admin).filter(Admin.username == "admin").first()
-    if not existing_admin:
-        admin = Admin(
-            username="admin",
-            hashed_password=hash_password("admin123"),
-            is_superuser=True  # Make default admin a superuser
-        )
-        db.add(admin)
-        db.commit()
-        print("✅ Default SUPERUSER admin created: username=admin, password=admin123")
-    elif not existing_admin.is_superuser:
-        # Upgrade existing admin to superuser
-        existing_admin.is_superuser = True
-        db.commit()
-        print("✅ Existing admin upgraded to SUPERUSER")
+    # Every worker runs this; the lock makes the first one do the setup and
+    # the others find the tables and admin row already in place
+    with init_lock():
+        init_db()
+        # Create default superuser admin (username: admin, password: admin123)
+        db = SessionLocal()
+        try:
+            existing_admin = db.query(Admin).filter(Admin.username == "admin").first()
+            if not existing_admin:
+                admin = Admin(
+                    username="admin",
+                    hashed_password=hash_password("admin123"),
+                    is_superuser=True  # Make default admin a superuser
+                )
+                db.add(admin)
+                db.commit()
+                print("✅ Default SUPERUSER admin created: username=admin, password=admin123")
+            elif not existing_admin.is_superuser:
+                # Upgrade existing admin to superuser
+                existing_admin.is_superuser = True
+                db.commit()
+                print("✅ Existing admin upgraded to SUPERUSER")
+        finally:
+            db.close()
+    
+    # Load image hashes for near-duplicate detection (kept in memory per worker)
+    db = SessionLocal()
+    try:
+        duplicate_index.sync(db)
+        print(f"✅ Duplicate index loaded: {duplicate_index.table.size} image hashes")
+    finally:
+        db.close()
     
     # ADD PRODUCTION VERIFICATION LOGS:
     import sys
@@ -131,6 +180,7 @@ def startup_event():
     
     # 1. Python version
     print(f"✓ Python version: {sys.version.split()[0]}")
+    print(f"✓ Worker process: pid {os.getpid()} (WEB_CONCURRENCY={WEB_CONCURRENCY})")
     
     # 2. Tesseract verification
     try:
@@ -233,6 +283,85 @@ def validate_strong_password(password: str) -> bool:
     return True
 
 
+# Columns fetched for receipt lists (plain row tuples instead of ORM objects)
+RECEIPT_LIST_COLUMNS = (
+    Receipt.id,
+    Receipt.user_name,
+    Receipt.user_phone,
+    Receipt.item_bought,
+    Receipt.approved_by,
+    Receipt.ocr_price,
+    Receipt.ocr_date,
+    Receipt.ocr_time,
+    Receipt.image_path,
+    Receipt.duplicate_of_id,
+    Receipt.created_at,
+    Receipt.updated_at,
+)
+
+# Rows per chunk when streaming receipt lists
+STREAM_BATCH_SIZE = 500
+
+
+def serialize_receipt(r, base_url: str) -> dict:
+    """
+    Convert a Receipt (ORM object or row tuple) to the JSON shape used by the
+    admin dashboard. Datetimes are left for the JSON encoder to format.
+    ocr_raw_text is left out; it is only sent by the receipt detail endpoint.
+    """
+    return {
+        "id": r.id,
+        "user_name": r.user_name,
+        "user_phone": r.user_phone,
+        "item_bought": r.item_bought,
+        "approved_by": r.approved_by,
+        "ocr_price": r.ocr_price,
+        "ocr_date": r.ocr_date,
+        "ocr_time": r.ocr_time,
+        # Build absolute image URL dynamically (avoids hardcoded localhost)
+        "image_path": f"{base_url}/{r.image_path}",
+        "duplicate_of_id": r.duplicate_of_id,
+        "created_at": r.created_at,
+        "updated_at": r.updated_at
+    }
+
+
+def stream_receipts(base_url: str, ndjson: bool):
+    """
+    Yield the receipt list in chunks so memory stays flat for large tables.
+    Uses its own session because request dependencies are closed before a
+    streamed body is sent.
+    """
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(*RECEIPT_LIST_COLUMNS)
+            .order_by(Receipt.created_at.desc())
+            .yield_per(STREAM_BATCH_SIZE)
+        )
+        separator = b"\n" if ndjson else b","
+        if not ndjson:
+            yield b'{"receipts":['
+        chunk = []
+        first = True
+        for r in rows:
+            item = orjson.dumps(serialize_receipt(r, base_url))
+            if ndjson:
+                chunk.append(item + separator)
+            else:
+                chunk.append(item if first else separator + item)
+            first = False
+            if len(chunk) >= STREAM_BATCH_SIZE:
+                yield b"".join(chunk)
+                chunk = []
+        if chunk:
+            yield b"".join(chunk)
+        if not ndjson:
+            yield b"]}"
+    finally:
+        db.close()
+
+
 # ============ API ROUTES ============
 
 @app.get("/")
@@ -241,6 +370,12 @@ def root():
     return {"message": "Church Treasury System API", "status": "running"}
 
 
+@app.get("/api/metrics/ocr")
+def ocr_metrics():
+    """OCR queue depth and rejection counts for monitoring (this worker only)"""
+    return {"worker_pid": os.getpid(), **ocr_admission.stats()}
+
+
 @app.post("/api/login")
 def login(username: str = Form(...), password: str = Form(...), 
           db: Session = Depends(get_db), Authorize: AuthJWT = Depends()):
@@ -416,6 +551,47 @@ def delete_admin(
 
 # ============ RECEIPT ROUTES ============
 
+def analyze_receipt_image(file_path: str) -> tuple:
+    """Perceptual hash + OCR for an uploaded image (runs on the OCR executor)"""
+    image_phash = None
+    try:
+        image_phash = compute_phash(file_path)
+    except Exception as e:
+        print(f"Image hash error: {e}")
+    return image_phash, extract_receipt_data(file_path)
+
+
+def save_upload_file(image: UploadFile, file_path: str):
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(image.file, buffer)
+
+
+def save_uploaded_receipt(db: Session, fields: dict, image_phash: Optional[str], ocr_data: dict) -> tuple:
+    """Duplicate check and insert for an analyzed upload; returns (receipt_id, duplicate_of_id)"""
+    # Check for the same receipt photographed before
+    duplicate_of_id = None
+    if image_phash:
+        try:
+            duplicate_of_id = duplicate_index.find_duplicate(db, image_phash)
+        except Exception as e:
+            print(f"Duplicate check error: {e}")
+    
+    # Create receipt record
+    receipt = Receipt(
+        **fields,
+        image_phash=image_phash,
+        duplicate_of_id=duplicate_of_id,
+        **ocr_data
+    )
+    
+    db.add(receipt)
+    db.flush()
+    publish_event(db, RECEIPT_CREATED, receipt.id)
+    publish_event(db, OCR_FINISHED, receipt.id)
+    db.commit()
+    return receipt.id, duplicate_of_id
+
+
 @app.post("/api/receipts/upload")
 async def upload_receipt(
     image: UploadFile = File(...),
@@ -431,41 +607,53 @@ async def upload_receipt(
     if not image.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Only image files allowed")
     
+    # Reject early (503 + Retry-After) when the OCR queue is full
+    ocr_admission.check()
+    
     # Save uploaded image
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{timestamp}_{image.filename}"
+    # Random part keeps concurrent uploads in the same second from overwriting each other
+    filename = f"{timestamp}_{uuid.uuid4().hex[:8]}_{image.filename}"
     file_path = f"uploads/{filename}"
     
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(image.file, buffer)
+    await asyncio.to_thread(save_upload_file, image, file_path)
     
-    # Run OCR on the image
-    ocr_data = extract_receipt_data(file_path)
+    # Hash and OCR the image off the event loop, within the OCR limits
+    try:
+        image_phash, ocr_data = await ocr_admission.run(analyze_receipt_image, file_path)
+    except HTTPException:
+        os.remove(file_path)
+        raise
     
-    # Create receipt record
-    receipt = Receipt(
-        user_name=user_name,
-        user_phone=user_phone,
-        item_bought=item_bought,
-        approved_by=approved_by,
-        image_path=file_path,
-        **ocr_data
+    # Duplicate lookup and commit can wait on the database write lock (up to
+    # SQLITE_BUSY_TIMEOUT), so keep them off the event loop as well
+    receipt_id, duplicate_of_id = await asyncio.to_thread(
+        save_uploaded_receipt, db,
+        dict(user_name=user_name, user_phone=user_phone, item_bought=item_bought,
+             approved_by=approved_by, image_path=file_path),
+        image_phash, ocr_data
     )
     
-    db.add(receipt)
-    db.commit()
-    db.refresh(receipt)
-    
     return {
         "message": "Receipt uploaded successfully",
-        "receipt_id": receipt.id,
-        "ocr_data": ocr_data
+        "receipt_id": receipt_id,
+        "ocr_data": ocr_data,
+        "possible_duplicate_of": duplicate_of_id
     }
 
 
 @app.get("/api/receipts")
-def get_receipts(request: Request, db: Session = Depends(get_db), Authorize: AuthJWT = Depends()):
-    """Admin endpoint to get all receipts"""
+def get_receipts(
+    request: Request,
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    Authorize: AuthJWT = Depends()
+):
+    """
+    Admin endpoint to get all receipts.
+    format=stream sends the same JSON document in chunks, format=ndjson sends
+    one receipt per line; both keep memory flat for large result sets.
+    """
     
     try:
         # Verify admin token
@@ -474,29 +662,29 @@ def get_receipts(request: Request, db: Session = Depends(get_db), Authorize: Aut
         current_user = Authorize.get_jwt_subject()
         print(f"✅ JWT verified for user: {current_user}")
         
-        receipts = db.query(Receipt).order_by(Receipt.created_at.desc()).all()
+        # Computed once instead of per row
+        base_url = str(request.base_url).rstrip('/')
+        
+        if format in ("stream", "ndjson"):
+            ndjson = format == "ndjson"
+            return StreamingResponse(
+                stream_receipts(base_url, ndjson),
+                media_type="application/x-ndjson" if ndjson else "application/json"
+            )
+        if format is not None:
+            raise HTTPException(status_code=400, detail="format must be 'stream' or 'ndjson'")
+        
+        receipts = (
+            db.query(*RECEIPT_LIST_COLUMNS)
+            .order_by(Receipt.created_at.desc())
+            .all()
+        )
         
         print(f"📋 Fetched {len(receipts)} receipts from database")
         
-        return {
-            "receipts": [
-                {
-                    "id": r.id,
-                    "user_name": r.user_name,
-                    "user_phone": r.user_phone,
-                    "item_bought": r.item_bought,
-                    "approved_by": r.approved_by,
-                    "ocr_price": r.ocr_price,
-                    "ocr_date": r.ocr_date,
-                    "ocr_time": r.ocr_time,
-                    "ocr_raw_text": r.ocr_raw_text,
-                    # Build absolute image URL dynamically (avoids hardcoded localhost)
-                    "image_path": f"{str(request.base_url).rstrip('/')}/{r.image_path}",
-                    "created_at": r.created_at.isoformat()
-                }
-                for r in receipts
-            ]
-        }
+        return ORJSONResponse({
+            "receipts": [serialize_receipt(r, base_url) for r in receipts]
+        })
     except HTTPException as http_err:
         print(f"❌ HTTP Error in /api/receipts: {http_err.status_code} - {http_err.detail}")
         raise
@@ -508,6 +696,97 @@ def get_receipts(request: Request, db: Session = Depends(get_db), Authorize: Aut
         raise HTTPException(status_code=500, detail=f"Failed to fetch receipts: {str(e)}")
 
 
+# How far before the cursor /api/receipts/changes looks again (see below)
+CHANGES_OVERLAP = timedelta(seconds=int(os.getenv("CHANGES_OVERLAP_SECONDS", "5")))
+
+
+@app.get("/api/receipts/changes")
+def get_receipt_changes(
+    request: Request,
+    since: Optional[str] = None,
+    db: Session = Depends(get_db),
+    Authorize: AuthJWT = Depends()
+):
+    """
+    Admin endpoint for incremental sync of the receipts list.
+    Returns receipts created/updated since `since` plus the ids of receipts
+    deleted since then, and a cursor to pass on the next call.
+    The query re-reads CHANGES_OVERLAP_SECONDS before the cursor: SQLite
+    stores whole seconds, and on PostgreSQL now() is the transaction start, so
+    a change can commit with a timestamp just behind a cursor already handed
+    out. Rows in the overlap are returned again; clients upsert by id.
+    """
+    
+    # Verify admin token
+    Authorize.jwt_required()
+    
+    since_dt = None
+    if since:
+        try:
+            since_dt = datetime.fromisoformat(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor, expected ISO timestamp")
+        if since_dt.tzinfo is not None:
+            # Stored timestamps are naive UTC
+            since_dt = since_dt.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    query = db.query(*RECEIPT_LIST_COLUMNS)
+    if since_dt is not None:
+        query = query.filter(Receipt.updated_at >= since_dt - CHANGES_OVERLAP)
+    receipts = query.order_by(Receipt.updated_at.asc()).all()
+    
+    # Tombstones only matter for clients that already hold a copy
+    deletions = []
+    if since_dt is not None:
+        deletions = (
+            db.query(ReceiptDeletion)
+            .filter(ReceiptDeletion.deleted_at >= since_dt - CHANGES_OVERLAP)
+            .order_by(ReceiptDeletion.deleted_at.asc())
+            .all()
+        )
+    
+    timestamps = [r.updated_at for r in receipts if r.updated_at]
+    timestamps += [d.deleted_at for d in deletions]
+    if since_dt is not None:
+        timestamps.append(since_dt)
+    cursor = max(timestamps).isoformat() if timestamps else None
+    
+    # SQLite can hand a deleted receipt's id to a new one; a live row means
+    # the tombstone is for the old receipt and must not remove the new one
+    live_ids = {r.id for r in receipts}
+    deleted_ids = sorted({d.receipt_id for d in deletions} - live_ids)
+    
+    base_url = str(request.base_url).rstrip('/')
+    return ORJSONResponse({
+        "receipts": [serialize_receipt(r, base_url) for r in receipts],
+        "deleted_ids": deleted_ids,
+        "cursor": cursor
+    })
+
+
+@app.get("/api/receipts/{receipt_id}")
+def get_receipt(
+    receipt_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    Authorize: AuthJWT = Depends()
+):
+    """Admin endpoint to get one receipt, including the full OCR text"""
+    
+    # Verify admin token
+    Authorize.jwt_required()
+    
+    receipt = db.query(Receipt).filter(Receipt.id == receipt_id).first()
+    
+    if not receipt:
+        raise HTTPException(status_code=404, detail="Receipt not found")
+    
+    base_url = str(request.base_url).rstrip('/')
+    data = serialize_receipt(receipt, base_url)
+    data["ocr_raw_text"] = receipt.ocr_raw_text
+    return ORJSONResponse(data)
+
+
 @app.put("/api/receipts/{receipt_id}")
 def update_receipt(
     receipt_id: int,
@@ -536,16 +815,24 @@ def update_receipt(
         receipt.approved_by = update_data.approved_by
     
     # Update OCR fields if provided (allow empty for OCR fields)
-    if update_data.ocr_price is not None:
+    corrected = receipt.corrected_ocr_fields()
+    # The edit form sends every field; only ones whose value changed count as corrections
+    if update_data.ocr_price is not None and update_data.ocr_price != receipt.ocr_price:
         receipt.ocr_price = update_data.ocr_price
-    if update_data.ocr_date is not None and update_data.ocr_date != "":
+        corrected.add("ocr_price")
+    if update_data.ocr_date and update_data.ocr_date != receipt.ocr_date:
         receipt.ocr_date = update_data.ocr_date
-    if update_data.ocr_time is not None and update_data.ocr_time != "":
+        corrected.add("ocr_date")
+    if update_data.ocr_time and update_data.ocr_time != receipt.ocr_time:
         receipt.ocr_time = update_data.ocr_time
+        corrected.add("ocr_time")
+    # Remembered so OCR reprocessing never overwrites admin corrections
+    receipt.manual_fields = ",".join(sorted(corrected))
     
-    # Update timestamp
-    receipt.updated_at = datetime.now()
+    # Update timestamp (database clock, same as created_at and deletion tombstones)
+    receipt.updated_at = func.now()
     
+    publish_event(db, RECEIPT_UPDATED, receipt.id)
     db.commit()
     db.refresh(receipt)
     
@@ -588,8 +875,10 @@ def delete_receipt(
         except Exception as e:
             print(f"Error deleting image file: {e}")
     
-    # Delete from database
+    # Delete from database and leave a tombstone for delta sync clients
     db.delete(receipt)
+    db.add(ReceiptDeletion(receipt_id=receipt_id))
+    publish_event(db, RECEIPT_DELETED, receipt_id)
     db.commit()
     
     return {
@@ -626,8 +915,10 @@ def bulk_delete_receipts(
                 except Exception as e:
                     errors.append(f"Error deleting image for receipt {receipt_id}: {e}")
             
-            # Delete from database
+            # Delete from database and leave a tombstone for delta sync clients
             db.delete(receipt)
+            db.add(ReceiptDeletion(receipt_id=receipt_id))
+            publish_event(db, RECEIPT_DELETED, receipt_id)
             deleted_count += 1
         else:
             errors.append(f"Receipt {receipt_id} not found")
@@ -641,6 +932,214 @@ def bulk_delete_receipts(
     }
 
 
+@app.get("/api/events")
+async def receipt_events(
+    request: Request,
+    token: Optional[str] = None,
+    Authorize: AuthJWT = Depends()
+):
+    """
+    Admin server-sent events stream of receipt changes.
+    Browsers' EventSource cannot set headers, so the token may be passed as
+    ?token=...; reconnecting clients resume from the Last-Event-ID header.
+    """
+    
+    # Verify admin token (query parameter or Authorization header)
+    if token:
+        Authorize.jwt_required("websocket", token=token)
+    else:
+        Authorize.jwt_required()
+    
+    last_event_id = request.headers.get("last-event-id")
+    after_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    
+    async def stream():
+        queue = broker.subscribe(after_id)
+        replayed: set[int] = set()
+        try:
+            yield "retry: 3000\n\n"
+            if after_id is not None:
+                # Catch up on events missed while disconnected
+                for event in await asyncio.to_thread(broker.replay, after_id):
+                    replayed.add(event["id"])
+                    yield format_sse(event)
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event["id"] in replayed:
+                    continue
+                yield format_sse(event)
+        finally:
+            broker.unsubscribe(queue)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ============ LEDGER ROUTES ============
+
+LEDGER_MAX_PAGE_SIZE = 200
+
+
+def parse_ledger_filters(start_date: Optional[str], end_date: Optional[str],
+                         page: int, page_size: int) -> list:
+    """Validate ledger query params; returns SQL filters on Receipt.created_at"""
+    if page < 1 or not 1 <= page_size <= LEDGER_MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"page must be >= 1 and page_size between 1 and {LEDGER_MAX_PAGE_SIZE}"
+        )
+    filters = []
+    try:
+        if start_date:
+            filters.append(Receipt.created_at >= datetime.fromisoformat(start_date))
+        if end_date:
+            # End date is inclusive
+            filters.append(Receipt.created_at < datetime.fromisoformat(end_date) + timedelta(days=1))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be in YYYY-MM-DD format")
+    return filters
+
+
+def ledger_rollup(db: Session, group_columns: list, filters: list, page: int, page_size: int) -> dict:
+    """Totals and counts per group, computed in SQL, largest total first"""
+    total = func.coalesce(func.sum(Receipt.ocr_price), 0.0).label("total")
+    grouped = (
+        db.query(
+            *group_columns,
+            total,
+            func.count(Receipt.id).label("count"),
+            func.min(Receipt.created_at).label("first_receipt_at"),
+            func.max(Receipt.created_at).label("last_receipt_at"),
+        )
+        .filter(*filters)
+        .group_by(*group_columns)
+    )
+    summary = db.query(
+        func.coalesce(func.sum(Receipt.ocr_price), 0.0),
+        func.count(Receipt.id),
+    ).filter(*filters).one()
+    total_groups = grouped.order_by(None).count()
+    rows = (
+        grouped.order_by(total.desc(), *group_columns)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
+    return {
+        "groups": [dict(row._mapping) for row in rows],
+        "page": page,
+        "page_size": page_size,
+        "total_groups": total_groups,
+        "grand_total": summary[0],
+        "receipt_count": summary[1]
+    }
+
+
+def ledger_receipts(db: Session, request: Request, filters: list, page: int, page_size: int) -> ORJSONResponse:
+    """One page of the receipts behind a ledger group, newest first"""
+    query = db.query(*RECEIPT_LIST_COLUMNS).filter(*filters)
+    total_receipts = query.order_by(None).count()
+    rows = (
+        query.order_by(Receipt.created_at.desc(), Receipt.id.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
+    base_url = str(request.base_url).rstrip('/')
+    return ORJSONResponse({
+        "receipts": [serialize_receipt(r, base_url) for r in rows],
+        "page": page,
+        "page_size": page_size,
+        "total_receipts": total_receipts
+    })
+
+
+@app.get("/api/ledger/submitters")
+def ledger_by_submitter(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 50,
+    db: Session = Depends(get_db),
+    Authorize: AuthJWT = Depends()
+):
+    """Admin endpoint: spending per member (user_phone + user_name)"""
+    
+    # Verify admin token
+    Authorize.jwt_required()
+    
+    filters = parse_ledger_filters(start_date, end_date, page, page_size)
+    return ledger_rollup(db, [Receipt.user_phone, Receipt.user_name], filters, page, page_size)
+
+
+@app.get("/api/ledger/submitters/receipts")
+def ledger_submitter_receipts(
+    request: Request,
+    user_phone: str,
+    user_name: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 50,
+    db: Session = Depends(get_db),
+    Authorize: AuthJWT = Depends()
+):
+    """Admin endpoint: receipts submitted by one member"""
+    
+    # Verify admin token
+    Authorize.jwt_required()
+    
+    filters = parse_ledger_filters(start_date, end_date, page, page_size)
+    filters += [Receipt.user_phone == user_phone, Receipt.user_name == user_name]
+    return ledger_receipts(db, request, filters, page, page_size)
+
+
+@app.get("/api/ledger/approvers")
+def ledger_by_approver(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 50,
+    db: Session = Depends(get_db),
+    Authorize: AuthJWT = Depends()
+):
+    """Admin endpoint: amounts signed off per approver"""
+    
+    # Verify admin token
+    Authorize.jwt_required()
+    
+    filters = parse_ledger_filters(start_date, end_date, page, page_size)
+    return ledger_rollup(db, [Receipt.approved_by], filters, page, page_size)
+
+
+@app.get("/api/ledger/approvers/receipts")
+def ledger_approver_receipts(
+    request: Request,
+    approved_by: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 50,
+    db: Session = Depends(get_db),
+    Authorize: AuthJWT = Depends()
+):
+    """Admin endpoint: receipts signed off by one approver"""
+    
+    # Verify admin token
+    Authorize.jwt_required()
+    
+    filters = parse_ledger_filters(start_date, end_date, page, page_size)
+    filters.append(Receipt.approved_by == approved_by)
+    return ledger_receipts(db, request, filters, page, page_size)
+
+
 # ============ FRONTEND STATIC (OPTIONAL) ============
 
 FRONTEND_DIST = os.getenv(
@@ -654,4 +1153,10 @@ if os.getenv("SERVE_FRONTEND", "0") == "1" and os.path.isdir(FRONTEND_DIST):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers need an import string so each process can load the app
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("BACKEND_HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=WEB_CONCURRENCY
+    )
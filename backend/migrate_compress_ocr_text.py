@@ -0,0 +1,84 @@
+"""
+Migration script to compress existing ocr_raw_text values
+Moves plain OCR text into the compressed column in batches, without
+touching updated_at, and reports the space saved.
+"""
+import argparse
+
+from sqlalchemy import text
+
+from database import SessionLocal, engine, init_db, IS_SQLITE
+from models import Receipt, compress_text
+
+BATCH_SIZE = 500
+
+
+def migrate_database(batch_size: int, vacuum: bool):
+    # Adds the ocr_raw_text_compressed column if it's missing
+    init_db()
+    
+    plain_bytes = 0
+    compressed_bytes = 0
+    migrated = 0
+    
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.execute(
+                text("SELECT id, ocr_raw_text FROM receipts "
+                     "WHERE ocr_raw_text IS NOT NULL ORDER BY id LIMIT :limit"),
+                {"limit": batch_size}
+            ).fetchall()
+            if not rows:
+                break
+            for receipt_id, raw_text in rows:
+                compressed = compress_text(raw_text)
+                plain_bytes += len(raw_text.encode("utf-8"))
+                compressed_bytes += len(compressed)
+                # Core update so onupdate doesn't bump updated_at for every row
+                db.execute(
+                    Receipt.__table__.update()
+                    .where(Receipt.__table__.c.id == receipt_id)
+                    .values(ocr_raw_text=None, ocr_raw_text_compressed=compressed,
+                            updated_at=Receipt.__table__.c.updated_at)
+                )
+            db.commit()
+            migrated += len(rows)
+            print(f"📝 Compressed {migrated} receipts...")
+    except Exception as e:
+        print(f"❌ Error during migration: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    
+    saved = plain_bytes - compressed_bytes
+    print("\n📋 Space Report:")
+    print("-" * 50)
+    print(f"  Receipts compressed: {migrated}")
+    print(f"  Plain text:          {plain_bytes / 1024:.1f} KB")
+    print(f"  Compressed:          {compressed_bytes / 1024:.1f} KB")
+    if plain_bytes:
+        print(f"  Saved:               {saved / 1024:.1f} KB ({saved / plain_bytes * 100:.0f}%)")
+    print("-" * 50)
+    
+    if vacuum:
+        # Space is only returned to the filesystem after a VACUUM
+        print("🧹 Reclaiming disk space...")
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM" if IS_SQLITE else "VACUUM receipts"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compress stored OCR text")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"rows per transaction (default: {BATCH_SIZE})")
+    parser.add_argument("--vacuum", action="store_true",
+                        help="run VACUUM afterwards to give the space back to the filesystem")
+    args = parser.parse_args()
+    
+    print("🔄 Starting OCR text compression...")
+    print("=" * 50)
+    migrate_database(args.batch_size, args.vacuum)
+    print("=" * 50)
+    print("✅ Migration complete!")
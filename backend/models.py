@@ -1,7 +1,11 @@
 """
 Database models for Church Treasury System
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean
+import zlib
+from datetime import timedelta
+from typing import Optional
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, Index, LargeBinary
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from database import Base
 
@@ -17,6 +21,18 @@ class Admin(Base):
     created_at = Column(DateTime, server_default=func.now())
 
 
+# OCR fields admins can correct through update_receipt
+EDITABLE_OCR_FIELDS = ("ocr_price", "ocr_date", "ocr_time")
+
+
+def compress_text(text: Optional[str]) -> Optional[bytes]:
+    return zlib.compress(text.encode("utf-8"), 6) if text is not None else None
+
+
+def decompress_text(data: Optional[bytes]) -> Optional[str]:
+    return zlib.decompress(data).decode("utf-8") if data is not None else None
+
+
 class Receipt(Base):
     """Receipt model storing user submission and OCR data"""
     __tablename__ = "receipts"
@@ -33,11 +49,70 @@ class Receipt(Base):
     ocr_price = Column(Float, nullable=True)
     ocr_date = Column(String, nullable=True)
     ocr_time = Column(String, nullable=True)
-    ocr_raw_text = Column(Text, nullable=True)  # Full OCR text for reference
+    # Full OCR text for reference, stored zlib-compressed. Both columns are
+    # deferred so list queries and ORM loads never read them; use the
+    # ocr_raw_text property. The plain column only holds rows that haven't been
+    # through migrate_compress_ocr_text.py yet.
+    ocr_raw_text_plain = deferred(Column("ocr_raw_text", Text, nullable=True))
+    ocr_raw_text_compressed = deferred(Column(LargeBinary, nullable=True))
+    # Comma-separated OCR fields corrected by an admin (NULL = not tracked yet)
+    manual_fields = Column(String, nullable=True)
     
     # Receipt image path
     image_path = Column(String, nullable=False)
+    # Perceptual hash of the image (16 hex chars) and the closest earlier
+    # receipt whose image looked the same at upload time
+    image_phash = Column(String(16), nullable=True)
+    duplicate_of_id = Column(Integer, nullable=True)
     
     # Timestamps
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
+    
+    # Ledger rollups group by submitter / approver and filter by date
+    __table_args__ = (
+        Index("ix_receipts_submitter", "user_phone", "user_name", "created_at"),
+        Index("ix_receipts_approver", "approved_by", "created_at"),
+    )
+    
+    @property
+    def ocr_raw_text(self) -> Optional[str]:
+        if self.ocr_raw_text_compressed is not None:
+            return decompress_text(self.ocr_raw_text_compressed)
+        return self.ocr_raw_text_plain
+    
+    @ocr_raw_text.setter
+    def ocr_raw_text(self, text: Optional[str]):
+        self.ocr_raw_text_compressed = compress_text(text)
+        self.ocr_raw_text_plain = None
+    
+    def corrected_ocr_fields(self) -> set:
+        """OCR fields an admin has corrected and that OCR must not overwrite"""
+        if self.manual_fields is not None:
+            return {f for f in self.manual_fields.split(",") if f}
+        # Rows edited before tracking existed: the only way updated_at moves
+        # away from created_at is an admin edit, so treat all OCR fields as manual.
+        # abs(): old edits stored local time against UTC created_at, so west of
+        # UTC an edited row can have updated_at before created_at
+        if self.created_at and self.updated_at and abs(self.updated_at - self.created_at) > timedelta(seconds=5):
+            return set(EDITABLE_OCR_FIELDS)
+        return set()
+
+
+class ReceiptDeletion(Base):
+    """Tombstone recorded when a receipt is deleted (used for delta sync)"""
+    __tablename__ = "receipt_deletions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    receipt_id = Column(Integer, nullable=False, index=True)
+    deleted_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
+
+
+class ReceiptEvent(Base):
+    """Receipt change event, shared between workers through the database"""
+    __tablename__ = "receipt_events"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String, nullable=False)
+    receipt_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
@@ -1,20 +1,53 @@
 """
 OCR utilities using pytesseract
 """
+import os
 import re
 from datetime import datetime
+from typing import Optional
 from PIL import Image, ImageOps, ImageFilter
 import pytesseract
 
+# "roi": fast layout pass, then OCR only the total/date/time lines (falls back
+# to full OCR when those are ambiguous). "full": always OCR the whole receipt.
+OCR_MODE = os.getenv("OCR_MODE", "roi").lower()
 
-def extract_receipt_data(image_path: str) -> dict:
+# Width the layout pass downsamples to
+LAYOUT_MAX_WIDTH = 1000
+
+# Extra space kept above/below each located line, as a fraction of its height
+ROI_PADDING = 0.6
+
+# Lines worth reading at full resolution
+TOTAL_LINE_RE = re.compile(r'total|amount|balance|due', re.IGNORECASE)
+# Total-looking lines that carry some other amount (subtotal, tax, tendered, change)
+NON_TOTAL_LINE_RE = re.compile(
+    r'\b(?:sub\s*-?\s*total|tax|vat|cash|card|change|tender\w*|paid|discount|savings?|tip)\b',
+    re.IGNORECASE
+)
+GRAND_TOTAL_LINE_RE = re.compile(r'grand\s*total', re.IGNORECASE)
+DATE_TIME_LINE_RE = re.compile(
+    r'\d{1,4}[-/.]\d{1,2}[-/.]\d{2,4}|\d{1,2}:\d{2}'
+    r'|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b',
+    re.IGNORECASE
+)
+
+
+def extract_receipt_data(image_path: str, mode: Optional[str] = None) -> dict:
     """
     Extract price, date, and time from receipt image using OCR
+    `mode` overrides OCR_MODE ("roi" or "full")
     Returns dict with extracted fields
     """
     try:
-        # Open image and run OCR with preprocessing + multiple configs
         image = Image.open(image_path)
+        
+        if (mode or OCR_MODE) == "roi":
+            roi_data = run_roi_ocr(image)
+            if roi_data is not None:
+                return roi_data
+        
+        # Run OCR on the whole image with preprocessing + multiple configs
         text = run_ocr_with_fallbacks(image)
         
         # Extract price (look for currency symbols and numbers)
@@ -96,12 +129,132 @@ def extract_time(text: str) -> str:
     return None
 
 
-def run_ocr_with_fallbacks(image: Image.Image) -> str:
-    """Run OCR with basic preprocessing and multiple tesseract configs."""
-    # Preprocess: grayscale, increase contrast, sharpen
+def preprocess(image: Image.Image) -> Image.Image:
+    """Grayscale, increase contrast, sharpen"""
     gray = ImageOps.grayscale(image)
     enhanced = ImageOps.autocontrast(gray)
-    sharpened = enhanced.filter(ImageFilter.SHARPEN)
+    return enhanced.filter(ImageFilter.SHARPEN)
+
+
+def find_candidate_lines(image: Image.Image) -> tuple[list, list]:
+    """
+    Fast low-resolution layout pass.
+    Returns (total_bands, date_bands) as (top, bottom) pixel ranges in the
+    original image for lines that look like totals or dates/times.
+    """
+    scale = min(1.0, LAYOUT_MAX_WIDTH / image.width)
+    small = image
+    if scale < 1.0:
+        small = image.resize((LAYOUT_MAX_WIDTH, max(1, int(image.height * scale))))
+    data = pytesseract.image_to_data(
+        preprocess(small), config="--oem 3 --psm 6", output_type=pytesseract.Output.DICT
+    )
+    
+    # Group words into lines
+    lines = {}
+    for i, word in enumerate(data["text"]):
+        if not word.strip():
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        top = data["top"][i]
+        bottom = top + data["height"][i]
+        if key in lines:
+            words, line_top, line_bottom = lines[key]
+            words.append(word)
+            lines[key] = (words, min(line_top, top), max(line_bottom, bottom))
+        else:
+            lines[key] = ([word], top, bottom)
+    
+    total_bands, date_bands = [], []
+    for words, top, bottom in lines.values():
+        text = " ".join(words)
+        pad = (bottom - top) * ROI_PADDING
+        band = (
+            max(0, int((top - pad) / scale)),
+            min(image.height, int((bottom + pad) / scale) + 1)
+        )
+        if TOTAL_LINE_RE.search(text):
+            total_bands.append(band)
+        if DATE_TIME_LINE_RE.search(text):
+            date_bands.append(band)
+    return merge_bands(total_bands), merge_bands(date_bands)
+
+
+def merge_bands(bands: list) -> list:
+    """Merge overlapping (top, bottom) ranges"""
+    merged = []
+    for top, bottom in sorted(bands):
+        if merged and top <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], bottom))
+        else:
+            merged.append((top, bottom))
+    return merged
+
+
+def ocr_bands(image: Image.Image, bands: list) -> str:
+    """High-resolution OCR of full-width horizontal strips of the image"""
+    texts = []
+    for top, bottom in bands:
+        crop = image.crop((0, top, image.width, bottom))
+        try:
+            texts.append(pytesseract.image_to_string(crop, config="--oem 3 --psm 6").strip())
+        except Exception:
+            continue
+    return "\n".join(t for t in texts if t)
+
+
+def pick_total(total_text: str) -> Optional[float]:
+    """
+    Price from the total lines read by the ROI pass. Prefers a grand total and
+    ignores subtotal/tax/tendered/change lines; returns None when the remaining
+    lines disagree, so the caller falls back to full-page OCR.
+    """
+    lines = [line for line in total_text.splitlines() if TOTAL_LINE_RE.search(line)]
+    candidates = [line for line in lines if GRAND_TOTAL_LINE_RE.search(line)]
+    if not candidates:
+        candidates = [line for line in lines if not NON_TOTAL_LINE_RE.search(line)]
+    amounts = {price for price in map(extract_price, candidates) if price is not None}
+    if len(amounts) != 1:
+        return None
+    return amounts.pop()
+
+
+def run_roi_ocr(image: Image.Image) -> Optional[dict]:
+    """
+    Two-phase OCR: locate total and date/time lines on a downsampled copy,
+    then read only those strips at full resolution.
+    Returns None when the total is missing or ambiguous or the date can't be
+    found, so the caller can fall back to full-page OCR.
+    """
+    try:
+        total_bands, date_bands = find_candidate_lines(image)
+    except Exception as e:
+        print(f"OCR layout pass failed: {str(e)}")
+        return None
+    if not total_bands or not date_bands:
+        return None
+    
+    sharpened = preprocess(image)
+    total_text = ocr_bands(sharpened, total_bands)
+    date_text = ocr_bands(sharpened, [b for b in date_bands if b not in total_bands])
+    text = "\n".join(t for t in (total_text, date_text) if t)
+    
+    price = pick_total(total_text)
+    date = extract_date(text)
+    if price is None or date is None:
+        return None
+    
+    return {
+        "ocr_price": price,
+        "ocr_date": date,
+        "ocr_time": extract_time(text),
+        "ocr_raw_text": text
+    }
+
+
+def run_ocr_with_fallbacks(image: Image.Image) -> str:
+    """Run OCR with basic preprocessing and multiple tesseract configs."""
+    sharpened = preprocess(image)
 
     # Try several configs to improve recall
     configs = [
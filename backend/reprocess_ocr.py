@@ -0,0 +1,143 @@
+"""
+Re-run OCR over receipts already stored in the database.
+
+Uses a process pool, writes results back one batch per transaction and
+records progress in a checkpoint file so an interrupted run can be resumed.
+Fields an admin corrected through update_receipt are never overwritten.
+
+Run from the backend directory:
+    python reprocess_ocr.py [--workers N] [--batch-size N] [--restart]
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from database import SessionLocal, init_db
+from models import Receipt
+from ocr_utils import extract_receipt_data
+from events import publish_event, RECEIPT_UPDATED
+
+DEFAULT_CHECKPOINT = "reprocess_ocr.checkpoint.json"
+
+
+def load_checkpoint(path: str) -> dict:
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {"last_id": 0, "processed": 0, "updated": 0, "skipped": 0}
+
+
+def save_checkpoint(path: str, state: dict):
+    # Write then rename so a crash never leaves a half-written checkpoint
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def ocr_receipt(job: tuple) -> tuple:
+    """Worker process: (receipt_id, image_path) -> (receipt_id, ocr_data or None)"""
+    receipt_id, image_path = job
+    if not os.path.exists(image_path):
+        return receipt_id, None
+    # Full-page OCR so the stored raw text stays the whole receipt, not ROI strips
+    return receipt_id, extract_receipt_data(image_path, mode="full")
+
+
+def apply_results(results: list) -> int:
+    """Write one batch of OCR results in a single transaction; returns rows changed"""
+    db = SessionLocal()
+    try:
+        changed = 0
+        for receipt_id, ocr_data in results:
+            raw_text = (ocr_data or {}).get("ocr_raw_text") or ""
+            if not raw_text.strip() or raw_text.startswith("OCR failed"):
+                # A failed or blank read is no better than what is stored
+                continue
+            receipt = db.query(Receipt).filter(Receipt.id == receipt_id).first()
+            if not receipt:
+                continue
+            corrected = receipt.corrected_ocr_fields()
+            updates = {
+                field: value for field, value in ocr_data.items()
+                if field not in corrected and value is not None and getattr(receipt, field) != value
+            }
+            # Start tracking corrections on legacy rows so later runs don't guess
+            if receipt.manual_fields is None:
+                receipt.manual_fields = ",".join(sorted(corrected))
+            if not updates:
+                continue
+            for field, value in updates.items():
+                setattr(receipt, field, value)
+            publish_event(db, RECEIPT_UPDATED, receipt.id)
+            changed += 1
+        db.commit()
+        return changed
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def reprocess(workers: int, batch_size: int, checkpoint: str, restart: bool):
+    init_db()
+    state = {"last_id": 0, "processed": 0, "updated": 0, "skipped": 0}
+    if not restart:
+        state = load_checkpoint(checkpoint)
+    if state["last_id"]:
+        print(f"⏩ Resuming after receipt id {state['last_id']}")
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            db = SessionLocal()
+            try:
+                jobs = (
+                    db.query(Receipt.id, Receipt.image_path)
+                    .filter(Receipt.id > state["last_id"])
+                    .order_by(Receipt.id.asc())
+                    .limit(batch_size)
+                    .all()
+                )
+            finally:
+                db.close()
+            if not jobs:
+                break
+            
+            results = list(pool.map(ocr_receipt, [tuple(j) for j in jobs]))
+            changed = apply_results(results)
+            
+            state["last_id"] = jobs[-1][0]
+            state["processed"] += len(results)
+            state["updated"] += changed
+            state["skipped"] += sum(1 for _, data in results if data is None)
+            save_checkpoint(checkpoint, state)
+            print(f"📝 Processed {state['processed']} receipts "
+                  f"({state['updated']} updated, {state['skipped']} missing images), "
+                  f"last id {state['last_id']}")
+    
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run OCR over stored receipts")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="OCR worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=50,
+                        help="receipts per transaction/checkpoint (default: 50)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT,
+                        help=f"checkpoint file (default: {DEFAULT_CHECKPOINT})")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore the checkpoint and start from the first receipt")
+    args = parser.parse_args()
+    
+    print("🔄 Starting OCR reprocessing...")
+    print("=" * 50)
+    state = reprocess(args.workers, args.batch_size, args.checkpoint, args.restart)
+    print("=" * 50)
+    print(f"✅ Reprocessing complete! {state['processed']} processed, {state['updated']} updated")
+
+
+if __name__ == "__main__":
+    main()
@@ -58,6 +58,7 @@ export default function ReceiptTable({ receipts, onUpdate, darkMode = false }) {
   const [menuAnchor, setMenuAnchor] = useState(null);
   const [menuReceiptId, setMenuReceiptId] = useState(null);
   const [expandedRows, setExpandedRows] = useState([]);
+  const [rawTexts, setRawTexts] = useState({});
   const [imagePreview, setImagePreview] = useState({ open: false, url: '', title: '' });
 
   const handleEdit = (receipt) => {
@@ -147,11 +148,24 @@ export default function ReceiptTable({ receipts, onUpdate, darkMode = false }) {
   };
 
   const toggleRowExpansion = (id) => {
+    if (!expandedRows.includes(id) && !(id in rawTexts)) {
+      fetchRawText(id);
+    }
     setExpandedRows(prev =>
       prev.includes(id) ? prev.filter(rowId => rowId !== id) : [...prev, id]
     );
   };
 
+  // OCR text isn't part of the list payload; load it when a receipt is expanded
+  const fetchRawText = async (id) => {
+    try {
+      const response = await api.get(`/receipts/${id}`);
+      setRawTexts(prev => ({ ...prev, [id]: response.data.ocr_raw_text }));
+    } catch (error) {
+      console.error('Failed to load OCR text:', error);
+    }
+  };
+
   const handleImagePreview = (url, title) => {
     setImagePreview({ open: true, url, title });
   };
@@ -287,6 +301,13 @@ export default function ReceiptTable({ receipts, onUpdate, darkMode = false }) {
                             border: receipt.approved_by ? '1px solid #c3e6cb' : '1px solid #f5c6cb',
                           }}
                         />
+                        {receipt.duplicate_of_id && (
+                          <Chip
+                            label={`Possible duplicate of #${receipt.duplicate_of_id}`}
+                            size="small"
+                            sx={{ mt: 0.5, ml: 0.5, fontWeight: 600, bgcolor: '#fff3cd', color: '#856404', border: '1px solid #ffeeba' }}
+                          />
+                        )}
                       </>
                     )}
                   </Box>
@@ -412,7 +433,7 @@ export default function ReceiptTable({ receipts, onUpdate, darkMode = false }) {
                           />
                         </Grid>
                       )}
-                      {receipt.ocr_raw_text && (
+                      {rawTexts[receipt.id] && (
                         <Grid item xs={12}>
                           <Typography variant="caption" color="text.secondary" display="block" gutterBottom>
                             📝 OCR Extracted Text
@@ -438,7 +459,7 @@ export default function ReceiptTable({ receipts, onUpdate, darkMode = false }) {
                                 lineHeight: 1.5,
                               }}
                             >
-                              {receipt.ocr_raw_text}
+                              {rawTexts[receipt.id]}
                             </Typography>
                           </Box>
                         </Grid>
@@ -855,9 +876,18 @@ export default function ReceiptTable({ receipts, onUpdate, darkMode = false }) {
                         >
                           <ReceiptLongIcon />
                         </Avatar>
-                        <Typography variant="body2" fontWeight={500} sx={{ color: darkMode ? '#ddd' : 'inherit' }}>
-                          {receipt.item_bought || 'Receipt'}
-                        </Typography>
+                        <Box>
+                          <Typography variant="body2" fontWeight={500} sx={{ color: darkMode ? '#ddd' : 'inherit' }}>
+                            {receipt.item_bought || 'Receipt'}
+                          </Typography>
+                          {receipt.duplicate_of_id && (
+                            <Chip
+                              label={`Possible duplicate of #${receipt.duplicate_of_id}`}
+                              size="small"
+                              sx={{ mt: 0.5, fontWeight: 600, bgcolor: '#fff3cd', color: '#856404', border: '1px solid #ffeeba' }}
+                            />
+                          )}
+                        </Box>
                       </Box>
                     )}
                   </TableCell>
@@ -1140,7 +1170,7 @@ export default function ReceiptTable({ receipts, onUpdate, darkMode = false }) {
                         </Grid>
                         
                         {/* OCR Extracted Data */}
-                        {receipt.ocr_raw_text && (
+                        {rawTexts[receipt.id] && (
                           <Box sx={{ mt: 2 }}>
                             <Paper 
                               elevation={0} 
@@ -1176,7 +1206,7 @@ export default function ReceiptTable({ receipts, onUpdate, darkMode = false }) {
                                     lineHeight: 1.6,
                                   }}
                                 >
-                                  {receipt.ocr_raw_text}
+                                  {rawTexts[receipt.id]}
                                 </Typography>
                               </Box>
                             </Paper>